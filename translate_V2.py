@@ -1,16 +1,1057 @@
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment
+from openpyxl.xml import LXML
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import iterparse
 from googletrans import Translator, LANGUAGES
+import httpx
 import time
-from typing import Dict, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import warnings
+from collections import OrderedDict, defaultdict
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 import re
 
+try:
+    from tqdm import tqdm
+except ImportError:  # 未安装 tqdm 时不显示进度条
+    tqdm = None
+
+
+# openpyxl 在安装了 lxml 时会自动使用它读写XML，保存速度明显更快
+if not LXML:
+    warnings.warn("未检测到 lxml，openpyxl 将使用较慢的标准库XML实现，建议执行: pip install lxml", RuntimeWarning)
+
+# 匹配中文字符（CJK统一汉字）
+# 调用前先用 str.isascii() 过滤：它只检查字符串内部的标志位，是 O(1) 的，
+# 可以让占多数的纯ASCII单元格（编号、英文、日期等）跳过正则匹配
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+# 译文单元格共用的对齐样式（openpyxl 的样式对象不可变，可以安全共用）
+_WRAP_TOP = Alignment(wrapText=True, vertical='top')
+_WRAP = Alignment(wrapText=True)
+
+# 生成缓存键时使用：连续空白折叠为一个空格，全角ASCII字符及全角空格转为半角
+_WHITESPACE_RE = re.compile(r'\s+')
+_FULLWIDTH_TO_ASCII = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULLWIDTH_TO_ASCII[0x3000] = ord(' ')
+
+# 使用 googletrans 时每批的最大条数和最大字符数
+# googletrans 4.0.0rc1 的 translate(list) 内部仍是逐条发送请求，不能减少请求次数，
+# 这里的分批只用于把文本分配给各个线程，字符数上限用于均衡各线程的工作量
+BATCH_SIZE = 50
+BATCH_MAX_CHARS = 4000
+
+# 使用 Google Cloud Translation 时每批的最大条数和最大字符数
+# 官方接口一次请求即可翻译整批文本，单次请求建议不超过30KB，中文在 UTF-8 中每字占3字节
+CLOUD_BATCH_SIZE = 100
+CLOUD_BATCH_MAX_CHARS = 10000
+
+# 默认并发翻译的线程数
+DEFAULT_MAX_WORKERS = 8
+
+# 默认每秒最多发送的翻译请求数（与旧版 delay=0.1 的请求频率相同）
+DEFAULT_QPS = 10.0
+
+# 请求失败后的最大尝试次数，以及指数退避的初始等待时间（秒）
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.25
+
+# 可以重试的网络/传输错误。httpx 0.13 的超时、连接错误直接沿用 httpcore 的异常类，
+# 不是 HTTPError 的子类，因此按名称逐个收集，兼容新旧版本
+_TRANSIENT_HTTP_ERRORS = tuple(
+    getattr(httpx, name)
+    for name in ('HTTPError', 'TransportError', 'TimeoutException', 'NetworkError', 'ProtocolError', 'ProxyError')
+    if hasattr(httpx, name)
+)
+
+# 自动调整时的最大列宽
+MAX_COLUMN_WIDTH = 50
+
+# 翻译请求的超时时间（秒）
+REQUEST_TIMEOUT = 10.0
+
+# 支持的翻译服务：googletrans 免费但有频率限制，google-cloud 为官方付费接口
+PROVIDERS = ('googletrans', 'google-cloud')
+
+# googletrans 与 Google Cloud Translation 语言代码的差异
+_CLOUD_LANGUAGE_CODES = {'zh-cn': 'zh-CN', 'zh-tw': 'zh-TW'}
+
+# 支持的输出写入方式
+WRITERS = ('openpyxl', 'pyexcelerate', 'excelize')
+
+# 进程内翻译缓存最多保留的条数，多次调用之间共享，超出后淘汰最久未使用的条目
+MEMORY_CACHE_SIZE = 8192
+
+# 持久化翻译缓存的默认路径，传入 None 可关闭
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.translate_cache.sqlite')
+
+
+class _RateLimiter:
+    """令牌桶限速器，限制每秒请求数，供多个线程共享"""
+
+    def __init__(self, qps: float, burst: int = 1):
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._last_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """阻塞当前线程，直到取得一个令牌"""
+        if self.qps <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_time) * self.qps)
+                self._last_time = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.qps
+
+            # 在锁外等待，避免阻塞其他线程
+            time.sleep(wait_time)
+
+
+def _normalize_text(text: str) -> str:
+    """
+    生成翻译缓存的键
+
+    只在空白、全角/半角和大小写上有差异的文本（例如复制粘贴的表头）共用同一个译文
+    """
+    return _WHITESPACE_RE.sub(' ', text.translate(_FULLWIDTH_TO_ASCII)).strip().casefold()
+
+
+def _dedupe_texts(texts: Iterable[str]) -> List[str]:
+    """按缓存键去重，每个键保留首次出现的原文（去掉首尾空白）"""
+    unique_texts: "OrderedDict[str, str]" = OrderedDict()
+    for text in texts:
+        unique_texts.setdefault(_normalize_text(text), text.strip())
+    return list(unique_texts.values())
+
+
+def _make_lookup(translation_cache: Dict[str, str]) -> Callable[[str], Optional[str]]:
+    """
+    返回查找单元格译文的函数
+
+    返回的函数接收单元格文本，返回 "译文\n原文" 格式的单元格内容，没有译文时返回 None。
+    同一列中相邻单元格经常是相同的文本，因此记住上一次的结果，命中时省去生成缓存键的开销
+    """
+    last_text = None
+    last_result = None
+
+    def lookup(text: str) -> Optional[str]:
+        nonlocal last_text, last_result
+        if text == last_text:
+            return last_result
+
+        translated = translation_cache.get(_normalize_text(text))
+        result = None if translated is None else f"{translated}\n{text.strip()}"
+        last_text, last_result = text, result
+        return result
+
+    return lookup
+
+
+class _LRUCache:
+    """容量有限的线程安全LRU缓存"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], str]:
+        """批量查询，返回命中的 键 -> 值，命中的条目移到最近使用的位置"""
+        result = {}
+        with self._lock:
+            for key in keys:
+                value = self._data.get(key)
+                if value is not None:
+                    self._data.move_to_end(key)
+                    result[key] = value
+        return result
+
+    def put(self, key: Tuple[str, str, str], value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# 进程内共享的翻译缓存，键为 (源语言, 目标语言, 缓存键)，位于持久化缓存之前
+_MEMORY_CACHE = _LRUCache(MEMORY_CACHE_SIZE)
+
+
+class _CloudTranslation(NamedTuple):
+    """与 googletrans 的翻译结果保持一致，只提供 text 属性"""
+    text: str
+
+
+class _CloudTranslator:
+    """
+    Google Cloud Translation v3 的翻译器，接口与 googletrans.Translator.translate() 的批量用法一致
+
+    需要安装 google-cloud-translate 并配置好应用默认凭据
+    """
+
+    # 整批文本在一次请求中翻译，限速和重试按批次进行
+    bulk_requests = True
+    batch_size = CLOUD_BATCH_SIZE
+    batch_max_chars = CLOUD_BATCH_MAX_CHARS
+
+    def __init__(self, project_id: str):
+        try:
+            from google.cloud import translate_v3
+            from google.api_core import exceptions as api_exceptions
+            from google.api_core.retry import if_transient_error
+        except ImportError:
+            raise ImportError("使用 provider='google-cloud' 需要先安装: pip install google-cloud-translate")
+
+        self._client = translate_v3.TranslationServiceClient()
+        self._parent = f"projects/{project_id}/locations/global"
+        self._if_transient_error = if_transient_error
+        self._deadline_exceeded = api_exceptions.DeadlineExceeded
+
+    def is_transient_error(self, error: Exception) -> bool:
+        """判断请求错误是否可以重试：服务端 5xx、429、超时和连接错误"""
+        return self._if_transient_error(error) or isinstance(error, self._deadline_exceeded)
+
+    def translate(self, texts: List[str], src: str = 'auto', dest: str = 'en') -> List[_CloudTranslation]:
+        """批量翻译，返回结果与输入顺序一致"""
+        request = {
+            'parent': self._parent,
+            'contents': texts,
+            'mime_type': 'text/plain',
+            'target_language_code': _CLOUD_LANGUAGE_CODES.get(dest, dest),
+        }
+        # 不指定源语言时由服务自动检测
+        if src != 'auto':
+            request['source_language_code'] = _CLOUD_LANGUAGE_CODES.get(src, src)
+        response = self._client.translate_text(request=request, timeout=REQUEST_TIMEOUT)
+        return [_CloudTranslation(item.translated_text) for item in response.translations]
+
+
+# 进程内共享的翻译器，多次调用之间复用 HTTP/2 连接
+_TRANSLATOR: Optional[Translator] = None
+_CLOUD_TRANSLATORS: Dict[str, _CloudTranslator] = {}
+_TRANSLATOR_LOCK = threading.Lock()
+
+
+def _get_translator(provider: str = 'googletrans', project_id: Optional[str] = None):
+    """
+    返回共享的翻译器实例，首次调用时创建
+
+    参数:
+        provider: 翻译服务，见 PROVIDERS
+        project_id: Google Cloud 项目ID，未指定时读取环境变量 GOOGLE_CLOUD_PROJECT
+    """
+    global _TRANSLATOR
+    if provider not in PROVIDERS:
+        raise ValueError(f"不支持的翻译服务: {provider}，可选: {', '.join(PROVIDERS)}")
+
+    with _TRANSLATOR_LOCK:
+        if provider == 'google-cloud':
+            project_id = project_id or os.environ.get('GOOGLE_CLOUD_PROJECT')
+            if not project_id:
+                raise ValueError("使用 provider='google-cloud' 需要指定 project_id 或设置环境变量 GOOGLE_CLOUD_PROJECT")
+            if project_id not in _CLOUD_TRANSLATORS:
+                _CLOUD_TRANSLATORS[project_id] = _CloudTranslator(project_id)
+            return _CLOUD_TRANSLATORS[project_id]
+
+        if _TRANSLATOR is None:
+            # 请求失败时抛出异常，以便重试
+            # googletrans 4.0.0rc1 直接把 timeout 赋给 httpx 0.13 的客户端，不做类型转换，必须传入 httpx.Timeout
+            _TRANSLATOR = Translator(raise_exception=True, http2=True, timeout=httpx.Timeout(REQUEST_TIMEOUT))
+        return _TRANSLATOR
+
+
+class _DiskCache:
+    """基于 SQLite 的持久化翻译缓存，多次运行之间复用翻译结果"""
+
+    # 每写入多少条提交一次
+    COMMIT_EVERY = 100
+    # 单条 SELECT 语句中最多的参数个数
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str, src_lang: str, tgt_lang: str):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT)")
+        self._prefix = f"{src_lang}:{tgt_lang}:"
+        self._pending = 0
+
+    def _key(self, text: str) -> str:
+        return self._prefix + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def load(self, texts: List[str]) -> Dict[str, str]:
+        """批量查询文本的译文，返回 原文 -> 译文"""
+        keys = {self._key(text): text for text in texts}
+        key_list = list(keys)
+        result = {}
+        for start in range(0, len(key_list), self.QUERY_CHUNK):
+            chunk = key_list[start:start + self.QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(f"SELECT key, value FROM cache WHERE key IN ({placeholders})", chunk)
+            for key, value in rows:
+                result[keys[key]] = value
+        return result
+
+    def store(self, text: str, translated: str) -> None:
+        """写入一条译文"""
+        self._conn.execute("INSERT OR IGNORE INTO cache (key, value) VALUES (?, ?)", (self._key(text), translated))
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+
+def _open_disk_cache(cache_path: Optional[str], src_lang: str, tgt_lang: str) -> Optional[_DiskCache]:
+    """打开持久化缓存，失败时只打印提示，不影响翻译"""
+    if not cache_path:
+        return None
+    try:
+        return _DiskCache(cache_path, src_lang, tgt_lang)
+    except sqlite3.Error as e:
+        print(f"无法打开翻译缓存 {cache_path}: {e}")
+        return None
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """
+    判断 googletrans 的请求错误是否可以重试
+
+    只重试网络/传输错误以及非200的响应（4.0.0rc1 对此抛出 "Unexpected status code" 的普通 Exception），
+    参数错误、代码错误等重试也不会成功，直接失败
+    """
+    if isinstance(error, _TRANSIENT_HTTP_ERRORS):
+        return True
+    return type(error) is Exception and str(error).startswith('Unexpected status code')
+
+
+def _iter_batches(
+        texts: List[str],
+        max_size: int = BATCH_SIZE,
+        max_chars: int = BATCH_MAX_CHARS
+) -> Iterator[List[str]]:
+    """
+    按条数和字符数把待翻译文本切分成批次
+
+    每个批次是线程池中的一个任务；是否能合并为一次请求取决于翻译器，
+    只有 Google Cloud Translation 会把整批文本放在一次请求中
+    """
+    batch: List[str] = []
+    batch_chars = 0
+    for text in texts:
+        if batch and (len(batch) >= max_size or batch_chars + len(text) > max_chars):
+            yield batch
+            batch = []
+            batch_chars = 0
+        batch.append(text)
+        batch_chars += len(text)
+    if batch:
+        yield batch
+
+
+class _TranslationStats(NamedTuple):
+    """一次翻译中各来源的唯一文本条数，用于统计真实的缓存命中率"""
+    unique: int       # 待翻译的唯一文本
+    memory_hits: int  # 进程内缓存命中
+    disk_hits: int    # 持久化缓存命中
+    requested: int    # 通过网络请求翻译
+    failed: int       # 网络请求失败
+
+
+def _translate_batches(
+        translator: Translator,
+        texts: List[str],
+        src_lang: str,
+        tgt_lang: str,
+        qps: float,
+        translation_cache: Dict[str, str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        disk_cache: Optional[_DiskCache] = None
+) -> _TranslationStats:
+    """
+    并发地批量翻译唯一文本，结果写入缓存，返回各来源的命中条数
+
+    参数:
+        translator: 翻译器实例，可以通过 batch_size / batch_max_chars 属性指定批次大小，
+            bulk_requests 为真时整批文本在一次请求中翻译，否则逐条请求
+        texts: 去重后的待翻译文本
+        src_lang: 源语言
+        tgt_lang: 目标语言
+        qps: 每秒最多发送的HTTP请求数，0 表示不限制
+        translation_cache: 翻译结果缓存，键为 _normalize_text() 生成的缓存键，值为译文
+        max_workers: 并发请求的线程数
+        disk_cache: 持久化缓存，命中的文本不再请求翻译
+    """
+    unique_count = len(texts)
+    memory_hits = disk_hits = failed = 0
+
+    # 先查询进程内缓存，再一次性查询持久化缓存
+    if texts:
+        cached = _MEMORY_CACHE.get_many([(src_lang, tgt_lang, _normalize_text(text)) for text in texts])
+        if cached:
+            memory_hits = len(cached)
+            translation_cache.update((key, value) for (_, _, key), value in cached.items())
+            texts = [text for text in texts if _normalize_text(text) not in translation_cache]
+
+    if texts and disk_cache is not None:
+        cached = disk_cache.load([_normalize_text(text) for text in texts])
+        if cached:
+            disk_hits = len(cached)
+            print(f"从本地缓存读取了 {len(cached)} 条翻译")
+            translation_cache.update(cached)
+            for key, value in cached.items():
+                _MEMORY_CACHE.put((src_lang, tgt_lang, key), value)
+            texts = [text for text in texts if _normalize_text(text) not in cached]
+
+    if not texts:
+        return _TranslationStats(unique_count, memory_hits, disk_hits, 0, 0)
+
+    # 允许每个线程首次请求立即发出，之后按 qps 补充令牌
+    rate_limiter = _RateLimiter(qps, burst=max_workers)
+    bulk_requests = getattr(translator, 'bulk_requests', False)
+    is_transient_error = getattr(translator, 'is_transient_error', _is_transient_error)
+
+    def send_request(content):
+        # 每次HTTP请求前取令牌，网络错误等临时失败按指数退避重试，其他错误直接抛出
+        for attempt in range(MAX_RETRIES):
+            rate_limiter.wait()
+            try:
+                return translator.translate(content, src=src_lang, dest=tgt_lang)
+            except Exception as e:
+                if attempt == MAX_RETRIES - 1 or not is_transient_error(e):
+                    raise
+                retry_delay = RETRY_BASE_DELAY * 2 ** attempt
+                print(f"翻译请求失败，{retry_delay:.2f} 秒后重试（第 {attempt + 1} 次）: {e}")
+                time.sleep(retry_delay)
+
+    def translate_batch(batch: List[str]) -> List[Optional[str]]:
+        """翻译一个批次，返回与输入顺序一致的译文，失败的文本为 None"""
+        if bulk_requests:
+            return [translated.text for translated in send_request(batch)]
+
+        # googletrans 对列表也是逐条请求，这里逐条限速和重试，单条失败不影响同批其他文本
+        results = []
+        for text in batch:
+            try:
+                results.append(send_request(text).text)
+            except Exception as e:
+                print(f"翻译失败: {text[:30]} - 错误: {e}")
+                results.append(None)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        batches = _iter_batches(
+            texts,
+            getattr(translator, 'batch_size', BATCH_SIZE),
+            getattr(translator, 'batch_max_chars', BATCH_MAX_CHARS),
+        )
+        futures = {pool.submit(translate_batch, batch): batch for batch in batches}
+
+        progress = tqdm(total=len(texts), desc="翻译进度", unit="条") if tqdm is not None else None
+
+        # 只在主线程写缓存，无需加锁
+        for future in as_completed(futures):
+            batch = futures[future]
+            if progress is not None:
+                progress.update(len(batch))
+            try:
+                # 返回结果与输入顺序一致
+                translations = future.result()
+                for text, translated in zip(batch, translations):
+                    if translated is None:
+                        failed += 1
+                        continue
+                    key = _normalize_text(text)
+                    translation_cache[key] = translated
+                    _MEMORY_CACHE.put((src_lang, tgt_lang, key), translated)
+                    if disk_cache is not None:
+                        disk_cache.store(key, translated)
+
+            except Exception as e:
+                failed += len(batch)
+                print(f"批量翻译失败: {len(batch)} 条文本 - 错误: {e}")
+
+        if progress is not None:
+            progress.close()
+
+    if disk_cache is not None:
+        disk_cache.commit()
+
+    return _TranslationStats(unique_count, memory_hits, disk_hits, len(texts), failed)
+
+
+def _translate_unique_texts(
+        translator: Translator,
+        texts: List[str],
+        src_lang: str,
+        tgt_lang: str,
+        qps: float,
+        max_workers: int,
+        cache_path: Optional[str]
+) -> Tuple[Dict[str, str], _TranslationStats]:
+    """打开持久化缓存并翻译唯一文本，返回 缓存键 -> 译文 的翻译结果以及命中统计"""
+    translation_cache: Dict[str, str] = {}
+    disk_cache = _open_disk_cache(cache_path, src_lang, tgt_lang)
+    try:
+        stats = _translate_batches(translator, texts, src_lang, tgt_lang, qps, translation_cache,
+                                   max_workers=max_workers, disk_cache=disk_cache)
+    finally:
+        if disk_cache is not None:
+            disk_cache.close()
+
+    # 发出的请求全部失败时不再继续写出一个没有译文的文件
+    if stats.requested and stats.failed == stats.requested:
+        raise RuntimeError(f"全部 {stats.requested} 条文本翻译失败，请检查网络连接、语言代码和翻译服务配置")
+    return translation_cache, stats
+
+
+def _text_width(text: str) -> int:
+    """计算文本按行拆分后的最大长度，用于估算列宽"""
+    return max(len(line) for line in text.split('\n'))
+
+
+def _load_read_only_workbook(input_file: str, data_only: bool = False):
+    """
+    以只读模式加载工作簿
+
+    只读模式按文件中的 <dimension> 标签截断每一行，而非 Excel 生成的文件经常把它写成 "A1"，
+    这里重置每个sheet的范围，按实际内容读取，避免丢失单元格
+    """
+    workbook = openpyxl.load_workbook(input_file, read_only=True, data_only=data_only)
+    for sheet in workbook.worksheets:
+        sheet.reset_dimensions()
+    return workbook
+
+
+def _read_merged_ranges(sheet) -> List[str]:
+    """
+    读取只读sheet的合并单元格范围
+
+    只读模式不会解析合并单元格，这里直接流式扫描sheet的XML获取 mergeCell 节点
+    """
+    merged_ranges = []
+    merge_tag = f"{{{SHEET_MAIN_NS}}}mergeCell"
+    with sheet._get_source() as src:
+        for _, element in iterparse(src):
+            if element.tag == merge_tag:
+                merged_ranges.append(element.get('ref'))
+            element.clear()
+    return merged_ranges
+
+
+def _iter_sheet_values(workbook, sheet_names: List[str]) -> Iterator[Tuple[str, int, int, object]]:
+    """逐个返回只读工作簿中有内容的单元格 (sheet名, 行号, 列号, 值)"""
+    for sheet_name in sheet_names:
+        sheet = workbook[sheet_name]
+        for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            for col_idx, value in enumerate(row, start=1):
+                if value is not None:
+                    yield sheet_name, row_idx, col_idx, value
+
+
+class _MergedRangeIndex:
+    """
+    按行扫描的合并区域索引，用于判断单元格是否为合并区域中的非主单元格
+
+    合并区域按起始行排序，查询时只检查覆盖当前行的区域；
+    要求按行号递增的顺序查询（与逐行读取sheet的顺序一致）
+    """
+
+    def __init__(self, merged_ranges: List[str]):
+        bounds = []
+        for merged_range in merged_ranges:
+            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(merged_range)
+            bounds.append((min_row, max_row, min_col, max_col))
+        bounds.sort()
+
+        self._bounds = bounds
+        self._next = 0
+        self._active: List[Tuple[int, int, int, int]] = []
+        self._row = 0
+
+    def _advance(self, row: int) -> None:
+        """移除已经结束的区域，加入从当前行之前开始的区域"""
+        active = [bounds for bounds in self._active if bounds[1] >= row]
+        while self._next < len(self._bounds) and self._bounds[self._next][0] <= row:
+            bounds = self._bounds[self._next]
+            if bounds[1] >= row:
+                active.append(bounds)
+            self._next += 1
+        self._active = active
+        self._row = row
+
+    def is_covered(self, row: int, col: int) -> bool:
+        """是否为合并区域中的非主单元格"""
+        if row != self._row:
+            self._advance(row)
+        for min_row, max_row, min_col, max_col in self._active:
+            if min_col <= col <= max_col:
+                return row != min_row or col != min_col
+        return False
+
+
+def _collect_cn_cells(
+        workbook,
+        sheet_names: List[str],
+        merged_ranges: Optional[Dict[str, List[str]]] = None,
+        col_max: Optional[Dict[str, Dict[int, int]]] = None
+) -> List[Tuple[str, int, int, str]]:
+    """
+    收集工作簿中包含中文的单元格，返回待翻译的工作列表 (sheet名, 行号, 列号, 文本)
+
+    只保存坐标和文本，不持有 openpyxl 的单元格对象
+
+    参数:
+        merged_ranges: 每个sheet的合并单元格范围。只读模式下合并区域的非主单元格可能仍带有值，
+            需要传入以便跳过；普通模式下这些单元格的值为 None，可以不传
+        col_max: 如果传入，同时记录不需要翻译的文本在每个sheet每列的最大长度
+    """
+    merged_index = {}
+    if merged_ranges is not None:
+        merged_index = {name: _MergedRangeIndex(merged_ranges[name]) for name in sheet_names}
+
+    # 循环中用到的函数先绑定为局部变量，省去每个单元格的全局和属性查找
+    has_cjk = _CJK_RE.search
+    text_width = _text_width
+    get_index = merged_index.get
+    cells = []
+    append = cells.append
+    for sheet_name, row_idx, col_idx, value in _iter_sheet_values(workbook, sheet_names):
+        if not value or not isinstance(value, str):
+            continue
+
+        # 先做廉价的文本判断，只有中文文本才检查合并范围
+        if not value.isascii() and has_cjk(value):
+            index = get_index(sheet_name)
+            if index is None or not index.is_covered(row_idx, col_idx):
+                append((sheet_name, row_idx, col_idx, value))
+        elif col_max is not None:
+            widths = col_max[sheet_name]
+            width = text_width(value)
+            if width > widths[col_idx]:
+                widths[col_idx] = width
+
+    return cells
+
+
+def _drop_translated_cells(
+        cells: List[Tuple[str, int, int, str]],
+        src_lang: str,
+        tgt_lang: str,
+        cache_path: Optional[str],
+        col_max: Optional[Dict[str, Dict[int, int]]] = None,
+        skipped_cells: Optional[List[Tuple[str, int, int, str]]] = None
+) -> List[Tuple[str, int, int, str]]:
+    """
+    去掉已经是 "译文\n原文" 格式的单元格，避免在已翻译的输出文件上再次运行时重复翻译
+
+    只有前几行与缓存（进程内或持久化）中其余各行的译文完全一致时才跳过，
+    "Note:\n中文说明" 这类本身就是多行的原文不会被误判
+
+    参数:
+        cache_path: 持久化翻译缓存路径，None 表示只查询进程内缓存
+        col_max: 如果传入，跳过的单元格按原内容记录列宽
+        skipped_cells: 如果传入，同时记录跳过的单元格，供需要重新设置格式的写入方式使用
+    """
+    has_cjk = _CJK_RE.search
+
+    # 单元格索引 -> 所有可能的 (译文, 原文缓存键) 拆分方式，原文部分必须包含中文
+    candidates: Dict[int, List[Tuple[str, str]]] = {}
+    for index, (_, _, _, text) in enumerate(cells):
+        if '\n' not in text:
+            continue
+        lines = text.split('\n')
+        splits = []
+        for split_at in range(1, len(lines)):
+            original = '\n'.join(lines[split_at:])
+            if has_cjk(original):
+                splits.append(('\n'.join(lines[:split_at]).strip(), _normalize_text(original)))
+        if splits:
+            candidates[index] = splits
+    if not candidates:
+        return cells
+
+    keys = list({key for splits in candidates.values() for _, key in splits})
+    known = {
+        key: value
+        for (_, _, key), value in _MEMORY_CACHE.get_many([(src_lang, tgt_lang, key) for key in keys]).items()
+    }
+    disk_cache = _open_disk_cache(cache_path, src_lang, tgt_lang)
+    if disk_cache is not None:
+        try:
+            known.update(disk_cache.load([key for key in keys if key not in known]))
+        finally:
+            disk_cache.close()
+
+    kept = []
+    skipped = 0
+    for index, cell in enumerate(cells):
+        splits = candidates.get(index)
+        if splits and any(translated and known.get(key, '').strip() == translated for translated, key in splits):
+            skipped += 1
+            if col_max is not None:
+                sheet_name, _, col, text = cell
+                widths = col_max[sheet_name]
+                widths[col] = max(widths[col], _text_width(text))
+            if skipped_cells is not None:
+                skipped_cells.append(cell)
+            continue
+        kept.append(cell)
+
+    if skipped:
+        print(f"跳过了 {skipped} 个已经翻译过的单元格")
+    return kept
+
+
+def _translate_workbook_streaming(
+        input_file: str,
+        output_file: str,
+        sheet_names: Optional[List[str]],
+        translator: Translator,
+        src_lang: str,
+        tgt_lang: str,
+        qps: float,
+        max_workers: int,
+        cache_path: Optional[str]
+) -> Tuple[int, int, _TranslationStats]:
+    """
+    以流式方式翻译Excel文件：只读模式读取，只写模式输出
+
+    内存占用不随文件大小增长，但输出的是新建的工作簿，
+    只保留单元格的值和合并单元格，原有样式、图表等不会保留，公式以文件中缓存的计算结果输出。
+    没有缓存结果的公式（例如由程序生成、未经 Excel 保存的文件）会同时读取公式原文，按公式写出。
+    译文单元格设置自动换行，翻译过的sheet按内容调整列宽
+
+    参数:
+        sheet_names: 要翻译的sheet名称列表，None 表示翻译所有sheet
+        cache_path: 持久化翻译缓存路径，None 表示不使用
+
+    返回:
+        处理的sheet数量、翻译的中文单元格数量，以及翻译命中统计
+    """
+    workbook = _load_read_only_workbook(input_file, data_only=True)
+    formula_book = None
+    try:
+        if sheet_names is None:
+            translate_names = list(workbook.sheetnames)
+        else:
+            translate_names = [name for name in workbook.sheetnames if name in sheet_names]
+
+        merged_ranges = {name: _read_merged_ranges(workbook[name]) for name in workbook.sheetnames}
+
+        # 第一步：收集唯一的中文文本，同时统计其他文本的列宽
+        col_max: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        cells = _collect_cn_cells(workbook, translate_names, merged_ranges, col_max)
+        # 新建的工作簿不会保留原格式，已翻译过的单元格也需要重新设置自动换行
+        translated_cells: List[Tuple[str, int, int, str]] = []
+        cells = _drop_translated_cells(cells, src_lang, tgt_lang, cache_path, col_max, translated_cells)
+        unique_texts = _dedupe_texts(text for _, _, _, text in cells)
+
+        # 第二步：分批并发翻译唯一文本
+        translation_cache, stats = _translate_unique_texts(
+            translator, unique_texts, src_lang, tgt_lang, qps, max_workers, cache_path
+        )
+
+        # 按 sheet -> 行号 -> 列号 整理译文，只写模式下必须在写入行之前确定列宽
+        translated: Dict[str, Dict[int, Dict[int, str]]] = defaultdict(lambda: defaultdict(dict))
+        for sheet_name, row, col, text in translated_cells:
+            translated[sheet_name][row][col] = text
+        lookup = _make_lookup(translation_cache)
+        text_width = _text_width
+        for sheet_name, row, col, text in cells:
+            widths = col_max[sheet_name]
+            translated_content = lookup(text)
+            if translated_content is None:
+                # 翻译失败，保留原文
+                widths[col] = max(widths[col], text_width(text))
+                continue
+            translated[sheet_name][row][col] = translated_content
+            widths[col] = max(widths[col], text_width(translated_content))
+
+        # 第三步：再次读取并逐行写入新工作簿
+        # 同时按公式模式读取一遍，计算结果缺失的单元格改为写出公式原文，避免公式被清空
+        formula_book = _load_read_only_workbook(input_file)
+        output = openpyxl.Workbook(write_only=True)
+        for sheet_name in workbook.sheetnames:
+            print(f"正在写入sheet: {sheet_name}")
+            sheet = workbook[sheet_name]
+            formula_rows = formula_book[sheet_name].iter_rows(values_only=True)
+            out_sheet = output.create_sheet(title=sheet_name)
+
+            # 调整列宽以适应新内容
+            for col_idx, max_length in col_max.get(sheet_name, {}).items():
+                if max_length > 0:
+                    adjusted_width = min(max_length + 2, MAX_COLUMN_WIDTH)  # 限制最大列宽
+                    out_sheet.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = adjusted_width
+
+            get_row_translated = translated.get(sheet_name, {}).get
+            append_row = out_sheet.append
+            wrap_top = _WRAP_TOP
+            formula_count = 0
+            rows = zip_longest(sheet.iter_rows(values_only=True), formula_rows, fillvalue=())
+            for row_idx, (row, formula_row) in enumerate(rows, start=1):
+                if None in row and any(formula_row):
+                    # 只有公式单元格在两种模式下一个为 None、一个有值
+                    row = list(row)
+                    for col_idx, (value, formula) in enumerate(zip(row, formula_row)):
+                        if value is None and formula is not None:
+                            row[col_idx] = formula
+                            formula_count += 1
+
+                row_translated = get_row_translated(row_idx)
+                if row_translated:
+                    row = list(row)
+                    for col_idx, translated_content in row_translated.items():
+                        # 译文单元格设置为自动换行，共用同一个对齐样式
+                        cell = WriteOnlyCell(out_sheet, value=translated_content)
+                        cell.alignment = wrap_top
+                        row[col_idx - 1] = cell
+                append_row(row)
+
+            if formula_count:
+                print(f"警告: sheet {sheet_name} 中有 {formula_count} 个公式没有缓存的计算结果，已按公式原文写出")
+
+            # 重新应用合并单元格
+            for merged_range in merged_ranges[sheet_name]:
+                out_sheet.merged_cells.add(merged_range)
+
+        output.save(output_file)
+
+    finally:
+        workbook.close()
+        if formula_book is not None:
+            formula_book.close()
+
+    return len(translate_names), len(cells), stats
+
+
+def _translate_workbook_excelize(
+        input_file: str,
+        output_file: str,
+        sheet_names: Optional[List[str]],
+        translator: Translator,
+        src_lang: str,
+        tgt_lang: str,
+        qps: float,
+        max_workers: int,
+        cache_path: Optional[str]
+) -> Tuple[int, int, _TranslationStats]:
+    """
+    用 excelize（Go 实现的 xlsx 库）在原文件上写入译文
+
+    读取使用 openpyxl 只读模式，写入时由 excelize 打开原文件，只修改翻译过的单元格，
+    图表、数据透视表等 openpyxl 无法保留的内容都会原样输出，适合非常大的文件
+
+    参数:
+        sheet_names: 要翻译的sheet名称列表，None 表示翻译所有sheet
+        cache_path: 持久化翻译缓存路径，None 表示不使用
+
+    返回:
+        处理的sheet数量、翻译的中文单元格数量，以及翻译命中统计
+    """
+    try:
+        import excelize
+    except ImportError:
+        raise ImportError("使用 writer='excelize' 需要先安装: pip install excelize")
+
+    # 第一步：只读模式收集需要翻译的单元格，同时统计其他文本的列宽
+    workbook = _load_read_only_workbook(input_file)
+    try:
+        if sheet_names is None:
+            translate_names = list(workbook.sheetnames)
+        else:
+            translate_names = [name for name in workbook.sheetnames if name in sheet_names]
+
+        merged_ranges = {name: _read_merged_ranges(workbook[name]) for name in translate_names}
+        col_max: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        cells = _collect_cn_cells(workbook, translate_names, merged_ranges, col_max)
+        cells = _drop_translated_cells(cells, src_lang, tgt_lang, cache_path, col_max)
+    finally:
+        workbook.close()
+
+    # 第二步：分批并发翻译唯一文本
+    unique_texts = _dedupe_texts(text for _, _, _, text in cells)
+    translation_cache, stats = _translate_unique_texts(
+        translator, unique_texts, src_lang, tgt_lang, qps, max_workers, cache_path
+    )
+
+    # 第三步：用 excelize 打开原文件，只写入译文
+    output = excelize.open_file(input_file)
+    try:
+        # 原样式ID -> 增加自动换行后的样式ID
+        wrap_style_ids: Dict[int, int] = {}
+
+        lookup = _make_lookup(translation_cache)
+        text_width = _text_width
+        get_column_letter = openpyxl.utils.get_column_letter
+        set_cell_value = output.set_cell_value
+        get_cell_style = output.get_cell_style
+        set_cell_style = output.set_cell_style
+        for sheet_name, row, col, text in cells:
+            widths = col_max[sheet_name]
+            translated_content = lookup(text)
+            if translated_content is None:
+                # 翻译失败，保留原文
+                widths[col] = max(widths[col], text_width(text))
+                continue
+
+            coordinate = f"{get_column_letter(col)}{row}"
+            try:
+                set_cell_value(sheet_name, coordinate, translated_content)
+
+                # 在原有样式基础上设置自动换行
+                style_id = get_cell_style(sheet_name, coordinate)
+                if style_id not in wrap_style_ids:
+                    style = output.get_style(style_id) or excelize.Style()
+                    style.alignment = excelize.Alignment(
+                        horizontal=style.alignment.horizontal if style.alignment else '',
+                        vertical='top',
+                        wrap_text=True
+                    )
+                    # 读取到的默认填充类型为 -1，直接写回会被 excelize 拒绝
+                    if style.fill is not None and style.fill.pattern < 0:
+                        style.fill = excelize.Fill()
+                    wrap_style_ids[style_id] = output.new_style(style)
+                set_cell_style(sheet_name, coordinate, coordinate, wrap_style_ids[style_id])
+                widths[col] = max(widths[col], text_width(translated_content))
+
+            except RuntimeError as e:
+                print(f"处理单元格 {sheet_name}!{coordinate} 时出错: {e}")
+                continue
+
+        # 调整列宽以适应新内容
+        for sheet_name, widths in col_max.items():
+            for col_idx, max_length in widths.items():
+                if max_length > 0:
+                    column_letter = openpyxl.utils.get_column_letter(col_idx)
+                    output.set_col_width(sheet_name, column_letter, column_letter,
+                                         min(max_length + 2, MAX_COLUMN_WIDTH))
+
+        output.save_as(output_file)
+
+    finally:
+        output.close()
+
+    return len(translate_names), len(cells), stats
+
+
+def _save_with_pyexcelerate(workbook, output_file: str) -> None:
+    """
+    用 pyexcelerate 写出已翻译的工作簿，写入速度比 openpyxl 快数倍
+
+    只保留单元格的值、合并单元格、列宽和自动换行，其余样式不会保留
+    """
+    try:
+        import pyexcelerate
+    except ImportError:
+        raise ImportError("使用 writer='pyexcelerate' 需要先安装: pip install pyexcelerate")
+
+    # 相同对齐方式的单元格共用一个样式对象
+    wrap_styles = {}
+
+    output = pyexcelerate.Workbook()
+    for sheet in workbook.worksheets:
+        print(f"正在写入sheet: {sheet.title}")
+        rows = []
+        wrapped_cells = []
+        for row_cells in sheet.iter_rows():
+            rows.append([cell.value for cell in row_cells])
+            for cell in row_cells:
+                if cell.has_style and cell.alignment.wrap_text:
+                    wrapped_cells.append((cell.row, cell.column, cell.alignment.vertical or 'bottom'))
+
+        out_sheet = output.new_sheet(sheet.title, data=rows)
+
+        # 自动换行
+        for row, col, vertical in wrapped_cells:
+            if vertical not in wrap_styles:
+                wrap_styles[vertical] = pyexcelerate.Style(
+                    alignment=pyexcelerate.Alignment(vertical=vertical, wrap_text=True)
+                )
+            out_sheet.set_cell_style(row, col, wrap_styles[vertical])
+
+        # 合并单元格
+        for merged_range in sheet.merged_cells.ranges:
+            out_sheet.range((merged_range.min_row, merged_range.min_col),
+                            (merged_range.max_row, merged_range.max_col)).merge()
+
+        # 列宽
+        for column_letter, dimension in sheet.column_dimensions.items():
+            if dimension.width:
+                col_idx = openpyxl.utils.column_index_from_string(column_letter)
+                for col in range(dimension.min or col_idx, (dimension.max or col_idx) + 1):
+                    out_sheet.set_col_style(col, pyexcelerate.Style(size=dimension.width))
+
+    output.save(output_file)
+
+
+def _save_workbook(workbook, output_file: str, writer: str) -> None:
+    """按指定的写入方式保存工作簿"""
+    if writer == 'pyexcelerate':
+        _save_with_pyexcelerate(workbook, output_file)
+    else:
+        workbook.save(output_file)
+
+
+def _check_writer(writer: str, streaming: bool) -> None:
+    """校验写入方式参数"""
+    if writer not in WRITERS:
+        raise ValueError(f"不支持的写入方式: {writer}，可选: {', '.join(WRITERS)}")
+    if streaming and writer != 'openpyxl':
+        raise ValueError("流式模式只支持 openpyxl 写入")
+
+
+def _print_stats(sheet_count: int, cell_count: int, stats: _TranslationStats) -> None:
+    """输出翻译统计信息"""
+    print(f"\n翻译统计:")
+    print(f"- 共处理了 {sheet_count} 个sheet")
+    print(f"- 缓存了 {stats.unique - stats.failed} 个唯一翻译")
+    if cell_count:
+        # 命中率：无需发送网络请求即可得到译文的中文单元格所占的比例，
+        # 包括同一次运行中的重复文本、进程内缓存和持久化缓存
+        duplicates = max(cell_count - stats.unique, 0)
+        hit_ratio = max(cell_count - stats.requested, 0) / cell_count
+        print(f"- 共 {cell_count} 个中文单元格，缓存命中率 {hit_ratio:.1%}"
+              f"（重复文本 {duplicates}，进程内缓存 {stats.memory_hits}，"
+              f"本地缓存 {stats.disk_hits}，网络请求 {stats.requested}）")
+    if stats.failed:
+        print(f"- {stats.failed} 条唯一文本翻译失败，对应单元格保留原文")
+
 
 def translate_excel_sheets(
         input_file: str,
         output_file: str,
         src_lang: str = 'zh-cn',
         tgt_lang: str = 'en',
-        delay: float = 0.1  # 延迟时间，避免请求过快
+        delay: Optional[float] = None,
+        *,
+        qps: float = DEFAULT_QPS,  # 限制请求频率，避免触发API限制
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        streaming: bool = False,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        writer: str = 'openpyxl',
+        provider: str = 'googletrans',
+        project_id: Optional[str] = None
 ) -> None:
     """
     翻译Excel文件中所有sheet的中文内容
@@ -20,142 +1061,99 @@ def translate_excel_sheets(
         output_file: 输出Excel文件路径
         src_lang: 源语言 (默认: 简体中文)
         tgt_lang: 目标语言 (默认: 英语)
-        delay: 请求延迟时间，避免触发API限制
+        delay: 已弃用，每次请求之间的间隔秒数，传入时换算为 qps=1/delay
+        qps: 每秒最多发送的翻译请求数，0 表示不限制。googletrans 每条文本一次请求，
+            google-cloud 每批文本一次请求
+        max_workers: 并发翻译的线程数
+        streaming: 是否使用流式读写，适合大文件，但不保留原有样式
+        cache_path: 持久化翻译缓存路径，None 表示不使用
+        writer: 输出写入方式，'openpyxl' 保留全部样式，'pyexcelerate' 写入更快但只保留值、合并单元格、列宽和换行，
+            'excelize' 只读加载并在原文件上写入译文，保留图表等内容，适合20MB以上的大文件
+        provider: 翻译服务，'googletrans' 免费使用，'google-cloud' 使用官方 Cloud Translation 接口，
+            吞吐量更高，适合包含数千条唯一文本的大文件
+        project_id: provider='google-cloud' 时的项目ID，未指定时读取环境变量 GOOGLE_CLOUD_PROJECT
     """
+    if delay is not None:
+        warnings.warn("delay 参数已弃用，请改用 qps（每秒请求数）", DeprecationWarning, stacklevel=2)
+        qps = 1 / delay if delay > 0 else 0
+
+    _check_writer(writer, streaming)
+
+    # 获取共享的翻译器
+    translator = _get_translator(provider, project_id)
 
-    # 初始化翻译器
-    translator = Translator()
+    if streaming or writer == 'excelize':
+        if streaming:
+            print(f"正在以流式模式处理文件: {input_file}")
+            translate_workbook = _translate_workbook_streaming
+        else:
+            print(f"正在使用 excelize 处理文件: {input_file}")
+            translate_workbook = _translate_workbook_excelize
+        sheet_count, cell_count, stats = translate_workbook(
+            input_file, output_file, None, translator, src_lang, tgt_lang, qps, max_workers, cache_path
+        )
+        print(f"翻译完成！已保存到: {output_file}")
+        _print_stats(sheet_count, cell_count, stats)
+        return
 
     # 加载Excel文件
     print(f"正在加载文件: {input_file}")
     workbook = openpyxl.load_workbook(input_file)
 
-    # 用于缓存翻译结果，避免重复翻译相同内容
-    translation_cache: Dict[str, str] = {}
-
-    # 翻译文本的函数
-    def translate_text(text: str) -> str:
-        """翻译单个文本，使用缓存"""
-        if not text or not isinstance(text, str):
-            return text
+    # 第一步：扫描整个工作簿，收集待翻译的单元格，同时统计其他文本的列宽
+    col_max: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    work = _collect_cn_cells(workbook, workbook.sheetnames, col_max=col_max)
+    work = _drop_translated_cells(work, src_lang, tgt_lang, cache_path, col_max)
+    unique_texts = _dedupe_texts(text for _, _, _, text in work)
+    print(f"共发现 {len(unique_texts)} 条唯一中文文本")
 
-        # 清理文本中的多余空格和换行
-        text = text.strip()
+    # 第二步：分批并发翻译唯一文本，结果缓存后供所有sheet使用
+    translation_cache, stats = _translate_unique_texts(
+        translator, unique_texts, src_lang, tgt_lang, qps, max_workers, cache_path
+    )
 
-        # 检查缓存
-        if text in translation_cache:
-            return translation_cache[text]
+    # 第三步：根据缓存回写单元格
+    print(f"正在写入 {len(work)} 个单元格的译文")
+    # 循环中用到的函数先绑定为局部变量，省去每个单元格的全局和属性查找
+    lookup = _make_lookup(translation_cache)
+    text_width = _text_width
+    wrap_top = _WRAP_TOP
+    sheet_cells = {name: workbook[name].cell for name in workbook.sheetnames}
+    for sheet_name, row, col, text in work:
+        widths = col_max[sheet_name]
+        translated_content = lookup(text)
+        if translated_content is None:
+            # 翻译失败，保留原文
+            widths[col] = max(widths[col], text_width(text))
+            continue
 
+        cell = sheet_cells[sheet_name](row=row, column=col)
         try:
-            # 翻译文本
-            translated = translator.translate(text, src=src_lang, dest=tgt_lang)
-            result = f"{translated.text}\n{text}"
-
-            # 存入缓存
-            translation_cache[text] = result
-
-            # 添加延迟避免请求过快
-            time.sleep(delay)
+            cell.value = translated_content
+            widths[col] = max(widths[col], text_width(translated_content))
 
-            return result
+            # 设置单元格格式为自动换行
+            cell.alignment = wrap_top
 
         except Exception as e:
-            print(f"翻译失败: '{text}' - 错误: {e}")
-            return text
+            print(f"处理单元格 {sheet_name}!{cell.coordinate} 时出错: {e}")
+            continue
 
-    # 遍历所有sheet
-    for sheet_name in workbook.sheetnames:
-        print(f"正在处理sheet: {sheet_name}")
+    # 调整列宽以适应新内容
+    for sheet_name, widths in col_max.items():
         sheet = workbook[sheet_name]
-
-        # 获取所有合并单元格的范围
-        merged_ranges = list(sheet.merged_cells.ranges)
-
-        # 创建一个集合来存储合并单元格的位置
-        merged_cells = set()
-        for merged_range in merged_ranges:
-            for row in range(merged_range.min_row, merged_range.max_row + 1):
-                for col in range(merged_range.min_col, merged_range.max_col + 1):
-                    merged_cells.add((row, col))
-
-        # 记录每个合并区域的主单元格（左上角）
-        merged_master_cells = {}
-        for merged_range in merged_ranges:
-            master_cell = sheet.cell(merged_range.min_row, merged_range.min_col)
-            for row in range(merged_range.min_row, merged_range.max_row + 1):
-                for col in range(merged_range.min_col, merged_range.max_col + 1):
-                    merged_master_cells[(row, col)] = master_cell
-
-        # 遍历所有有内容的单元格
-        for row in range(1, sheet.max_row + 1):
-            for col in range(1, sheet.max_column + 1):
-                # 跳过合并单元格中的非主单元格
-                if (row, col) in merged_cells:
-                    # 如果是合并单元格但不是主单元格，跳过
-                    if (row, col) in merged_master_cells:
-                        cell = merged_master_cells[(row, col)]
-                        # 检查是否已经处理过这个合并区域
-                        if row != merged_master_cells[(row, col)].row or col != merged_master_cells[(row, col)].column:
-                            continue
-                    else:
-                        continue
-                else:
-                    cell = sheet.cell(row=row, column=col)
-
-                # 检查单元格是否有内容
-                if cell.value and isinstance(cell.value, str):
-                    # 检查单元格内容是否包含中文
-                    if re.search(r'[\u4e00-\u9fff]', cell.value):
-                        try:
-                            # 翻译内容
-                            translated_content = translate_text(cell.value)
-                            cell.value = translated_content
-
-                            # 设置单元格格式为自动换行
-                            cell.alignment = openpyxl.styles.Alignment(
-                                wrapText=True,
-                                vertical='top'
-                            )
-
-                        except Exception as e:
-                            print(f"处理单元格 {cell.coordinate} 时出错: {e}")
-                            continue
-
-        # 调整列宽以适应新内容
-        for col_idx in range(1, sheet.max_column + 1):
-            max_length = 0
-            column_letter = openpyxl.utils.get_column_letter(col_idx)
-
-            for row in range(1, sheet.max_row + 1):
-                cell = sheet.cell(row=row, column=col_idx)
-                if cell.value:
-                    # 检查是否为合并单元格的非主单元格
-                    if (row, col_idx) in merged_cells:
-                        if (row, col_idx) in merged_master_cells:
-                            master_cell = merged_master_cells[(row, col_idx)]
-                            if master_cell.row != row or master_cell.column != col_idx:
-                                continue
-
-                    # 计算单元格内容的最大长度
-                    if isinstance(cell.value, str):
-                        cell_length = max(len(line) for line in cell.value.split('\n'))
-                        if cell_length > max_length:
-                            max_length = cell_length
-
-            # 设置列宽
+        for col_idx, max_length in widths.items():
             if max_length > 0:
-                adjusted_width = min(max_length + 2, 50)  # 限制最大列宽为50
-                sheet.column_dimensions[column_letter].width = adjusted_width
+                adjusted_width = min(max_length + 2, MAX_COLUMN_WIDTH)  # 限制最大列宽
+                sheet.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = adjusted_width
 
     # 保存结果到新文件
     print(f"正在保存结果到: {output_file}")
-    workbook.save(output_file)
+    _save_workbook(workbook, output_file, writer)
     print("翻译完成！")
 
     # 输出统计信息
-    print(f"\n翻译统计:")
-    print(f"- 共处理了 {len(workbook.sheetnames)} 个sheet")
-    print(f"- 缓存了 {len(translation_cache)} 个唯一翻译")
+    _print_stats(len(workbook.sheetnames), len(work), stats)
 
 
 def translate_selected_sheets(
@@ -163,7 +1161,15 @@ def translate_selected_sheets(
         output_file: str,
         sheet_names: list,
         src_lang: str = 'zh-cn',
-        tgt_lang: str = 'en'
+        tgt_lang: str = 'en',
+        *,
+        qps: float = DEFAULT_QPS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        streaming: bool = False,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        writer: str = 'openpyxl',
+        provider: str = 'googletrans',
+        project_id: Optional[str] = None
 ) -> None:
     """
     翻译Excel文件中指定的sheet
@@ -174,73 +1180,57 @@ def translate_selected_sheets(
         sheet_names: 要翻译的sheet名称列表
         src_lang: 源语言
         tgt_lang: 目标语言
+        qps: 每秒最多发送的翻译请求数，0 表示不限制。googletrans 每条文本一次请求，
+            google-cloud 每批文本一次请求
+        max_workers: 并发翻译的线程数
+        streaming: 是否使用流式读写，适合大文件，但不保留原有样式
+        cache_path: 持久化翻译缓存路径，None 表示不使用
+        writer: 输出写入方式，'openpyxl' 保留全部样式，'pyexcelerate' 写入更快但只保留值、合并单元格、列宽和换行，
+            'excelize' 只读加载并在原文件上写入译文，保留图表等内容，适合20MB以上的大文件
+        provider: 翻译服务，'googletrans' 免费使用，'google-cloud' 使用官方 Cloud Translation 接口，
+            吞吐量更高，适合包含数千条唯一文本的大文件
+        project_id: provider='google-cloud' 时的项目ID，未指定时读取环境变量 GOOGLE_CLOUD_PROJECT
     """
+    _check_writer(writer, streaming)
+
+    # 获取共享的翻译器
+    translator = _get_translator(provider, project_id)
 
-    # 初始化翻译器
-    translator = Translator()
+    if streaming or writer == 'excelize':
+        translate_workbook = _translate_workbook_streaming if streaming else _translate_workbook_excelize
+        translate_workbook(
+            input_file, output_file, sheet_names, translator, src_lang, tgt_lang, qps, max_workers, cache_path
+        )
+        print(f"指定sheet翻译完成！已保存到: {output_file}")
+        return
 
     # 加载Excel文件
     workbook = openpyxl.load_workbook(input_file)
 
-    translation_cache = {}
+    # 先收集所有指定sheet中待翻译的单元格，统一翻译唯一文本
+    selected_names = [name for name in workbook.sheetnames if name in sheet_names]
+    for sheet_name in selected_names:
+        print(f"正在处理sheet: {sheet_name}")
+    work = _collect_cn_cells(workbook, selected_names)
+    work = _drop_translated_cells(work, src_lang, tgt_lang, cache_path)
+    unique_texts = _dedupe_texts(text for _, _, _, text in work)
+    translation_cache, stats = _translate_unique_texts(
+        translator, unique_texts, src_lang, tgt_lang, qps, max_workers, cache_path
+    )
 
-    for sheet_name in sheet_names:
-        if sheet_name in workbook.sheetnames:
-            print(f"正在处理sheet: {sheet_name}")
-            sheet = workbook[sheet_name]
+    lookup = _make_lookup(translation_cache)
+    wrap = _WRAP
+    sheet_cells = {name: workbook[name].cell for name in selected_names}
+    for sheet_name, row, col, text in work:
+        translated_content = lookup(text)
+        if translated_content is not None:
+            cell = sheet_cells[sheet_name](row=row, column=col)
+            cell.value = translated_content
+
+            # 设置自动换行
+            cell.alignment = wrap
 
-            # 处理合并单元格
-            merged_ranges = list(sheet.merged_cells.ranges)
-            merged_cells = set()
-            for merged_range in merged_ranges:
-                for row in range(merged_range.min_row, merged_range.max_row + 1):
-                    for col in range(merged_range.min_col, merged_range.max_col + 1):
-                        merged_cells.add((row, col))
-
-            # 只处理主单元格
-            merged_master_cells = {}
-            for merged_range in merged_ranges:
-                master_cell = sheet.cell(merged_range.min_row, merged_range.min_col)
-                for row in range(merged_range.min_row, merged_range.max_row + 1):
-                    for col in range(merged_range.min_col, merged_range.max_col + 1):
-                        merged_master_cells[(row, col)] = master_cell
-
-            for row in range(1, sheet.max_row + 1):
-                for col in range(1, sheet.max_column + 1):
-                    # 跳过合并单元格的非主单元格
-                    if (row, col) in merged_cells:
-                        if (row, col) in merged_master_cells:
-                            cell = merged_master_cells[(row, col)]
-                            if row != cell.row or col != cell.column:
-                                continue
-                        else:
-                            continue
-                    else:
-                        cell = sheet.cell(row=row, column=col)
-
-                    if cell.value and isinstance(cell.value, str):
-                        # 检查是否包含中文
-                        if re.search(r'[\u4e00-\u9fff]', cell.value):
-                            text = cell.value.strip()
-
-                            if text in translation_cache:
-                                cell.value = translation_cache[text]
-                            else:
-                                try:
-                                    translated = translator.translate(text, src=src_lang, dest=tgt_lang)
-                                    result = f"{translated.text}\n{text}"
-                                    translation_cache[text] = result
-                                    cell.value = result
-
-                                    # 设置自动换行
-                                    cell.alignment = openpyxl.styles.Alignment(wrapText=True)
-                                    time.sleep(0.1)
-
-                                except Exception as e:
-                                    print(f"翻译失败: '{text}' - 错误: {e}")
-                                    continue
-
-    workbook.save(output_file)
+    _save_workbook(workbook, output_file, writer)
     print(f"指定sheet翻译完成！已保存到: {output_file}")
 
 